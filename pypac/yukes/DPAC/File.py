@@ -1,11 +1,20 @@
 
-from io import BytesIO
 import json
-from struct import error, unpack
+import logging
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from struct import error, Struct
 from typing import BinaryIO
 from dataclasses import dataclass
 from functools import lru_cache
 
+log = logging.getLogger(__name__)
+
+_HDR = Struct("<3I")
+_FOLDER = Struct("<I2H")
+_ENTRY = Struct("<4s2H")
+
 @dataclass(slots=True)
 class FilePos:
 	sector: int
@@ -19,83 +28,129 @@ class File:
 
 	def __init__(self, path: str):
 		assert ".PAC" in path or ".pac" in path
+		self._decoded_entries = None
+		self._path = path
+		self._mm = None
+		self._data = None
 		with open(path, "rb", buffering=2048) as p:
 			self.add_entry(p)
 		File.FILE_ID += 1
 
 	def add_entry(self, file: BinaryIO):
-		RECORD_COUNT = 3
+		RECORD_COUNT = 2
 		ID = b"DPAC"
 		assert file.read(4) == ID
-		TOC, DATA, SECTOR_SIZE = unpack("<3I", file.read(12))
+		TOC, DATA, SECTOR_SIZE = _HDR.unpack(file.read(12))
 		assert SECTOR_SIZE == 7
 		file.seek(2048)
-		toc = BytesIO(file.read(TOC))
-		START_OF_DATA = (SECTOR_SIZE + 1) * 2048
-		file.seek(START_OF_DATA)
-		self.data = file.read(DATA)
+		toc = file.read(TOC)
+		self._data_start = (SECTOR_SIZE + 1) * 2048
+		self._data_size = DATA
 		ENTRY = {}
-		while toc.tell() < len(toc.getvalue()):
-
-			folder = unpack("4s", toc.read(4))[0].rstrip(b"\x20").decode("cp1252")
+		pos = 0
+		toc_len = len(toc)
+		while pos < toc_len:
 
-			count: int
-			fsector: int
-			count, fsector = unpack("<2H", toc.read(4))
+			folder, count, fsector = _FOLDER.unpack_from(toc, pos)
+			pos += 8
 
-			for i in range(0, count, 2):
-				name, sector, size = unpack("<4s2H", toc.read(8))
-				size *= 256
-				ENTRY.setdefault(folder, {})[name.rstrip(b"\x20").decode("cp1252")] = {
-					"lsn": sector,
-					"size": size,
-				}
+			n = count // RECORD_COUNT
+			end = pos + n * 8
+			ENTRY.setdefault(folder, {}).update({
+				name: {"lsn": sector, "size": size * 256}
+				for name, sector, size in _ENTRY.iter_unpack(toc[pos:end])
+			})
+			pos = end
 		self.buffer = {
 			ID.decode("cp1252"): {
 				"head": {"id": 255, "uid": File.FILE_ID, "entries": ENTRY}
 			}
 		}
+	def _decoded(self) -> dict:
+		if self._decoded_entries is None:
+			self._decoded_entries = {
+				key.to_bytes(4, 'little').rstrip(b"\x20").decode("cp1252"): {
+					name.rstrip(b"\x20").decode("cp1252"): meh
+					for name, meh in files.items()
+				}
+				for key, files in self.buffer['DPAC']['head']['entries'].items()
+			}
+		return self._decoded_entries
+
+	def _map(self) -> mmap.mmap:
+		if self._mm is None:
+			with open(self._path, "rb") as f:
+				self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+			if hasattr(self._mm, "madvise"):
+				self._mm.madvise(mmap.MADV_RANDOM)
+			self._data = memoryview(self._mm)[self._data_start:self._data_start + self._data_size]
+		return self._mm
+
+	@property
+	def mm(self) -> mmap.mmap:
+		return self._map()
+
+	@property
+	def data(self) -> memoryview:
+		self._map()
+		return self._data
+
 	def dump(self, path: str):
+		head = self.buffer['DPAC']['head']
+		out = {'DPAC': {'head': {'id': head['id'], 'uid': head['uid'], 'entries': self._decoded()}}}
 		with open(path, 'w') as j:
-			return json.dump(self.buffer, j, indent=4)
+			return json.dump(out, j, indent=4)
+
+	def extract(self, output_root: str):
+		tasks = [
+			(os.path.join(output_root, folder), files)
+			for folder, files in self._decoded().items()
+		]
+		if hasattr(self.mm, 'madvise'):
+			self.mm.madvise(mmap.MADV_SEQUENTIAL)
+		try:
+			with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as pool:
+				list(pool.map(self._extract_folder, tasks))
+		finally:
+			if hasattr(self.mm, 'madvise'):
+				self.mm.madvise(mmap.MADV_RANDOM)
+
+	def _extract_folder(self, task: tuple):
+		folder_path, files = task
+		WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+		os.makedirs(folder_path, exist_ok=True)
+		prefix = os.fsencode(folder_path) + os.sep.encode()
+		for name, meh in files.items():
+			offset = meh['lsn'] * 2048
+			fd = os.open(prefix + os.fsencode(name), WRITE_FLAGS, 0o644)
+			os.write(fd, self.data[offset:offset + meh['size']])
+			os.close(fd)
 
 	
 	@lru_cache(maxsize=4096, typed=True)
 	def search(self, path: str = '/EMD/0202') -> FilePos:
-		HANDLE = FilePos(0, 0, 0)
 		_, folder, file = path.split('/')
-		for key, value in self.buffer.items():
-			assert key == 'DPAC'
-			assert isinstance(value, dict)
-			for key2, value2 in value.items():
-				assert key2 == 'head'
-				for key3, value3 in value2.items():
-					if key3 == 'id':
-						assert value3 == 255
-					elif key3 == 'uid':
-						assert value3 < 256
-						uid = value3
-					if key3 == 'entries':
-						for gotfolder, thing in value3.items():
-							if gotfolder == folder:
-								for filee, meh in thing.items():
-									if file == filee:
-										for key4, value4 in meh.items():
-											if key4 == 'lsn':
-												HANDLE.sector = value4
-											if key4 == 'size':
-												assert value4 > 0
-												HANDLE.size = value4
-												assert HANDLE.size > 0
-										HANDLE.uid = uid
-										return HANDLE
-	def read(self, handle: FilePos, size: int) -> bytes:
+		folder_key = int.from_bytes(folder.encode("cp1252").ljust(4, b"\x20"), 'little')
+		file_key = file.encode("cp1252").ljust(4, b"\x20")
+		head = self.buffer['DPAC']['head']
+		assert head['id'] == 255
+		assert head['uid'] < 256
+		thing = head['entries'].get(folder_key)
+		if thing is None:
+			return None
+		meh = thing.get(file_key)
+		if meh is None:
+			return None
+		assert meh['size'] > 0
+		return FilePos(meh['lsn'], meh['size'], head['uid'])
+	def read(self, handle: FilePos, size: int) -> memoryview:
 		offset = (handle.sector) * 2048
-		print(offset)
 		cs = offset + size
-		print(cs)
+		if log.isEnabledFor(logging.DEBUG):
+			log.debug("read %d..%d", offset, cs)
 		return self.data[offset:cs]
 
 if __name__ == '__main__':
-	p = File(r"C:\mods\Patches\PS2\WWE RAW NEW GENERATION\pac\m.pac")
+	import sys
+	p = File(sys.argv[1])
 	p.dump('M.JSON')
\ No newline at end of file
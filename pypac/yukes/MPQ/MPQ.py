@@ -1,6 +1,10 @@
-from struct import unpack
+import os
+from struct import Struct
 from typing import BinaryIO
 
+_HDR = Struct(">3I")
+_TABLE = Struct(">2I")
+
 class MPQ:
 	def __init__(self, path: str):
 		with open(path, 'rb') as mpq:
@@ -9,13 +13,18 @@ class MPQ:
 	def to_dict(self, handle: BinaryIO):
 		entries = []
 		assert handle.read(4) == b'MPQ\0'
-		file_loc, table_loc, table_count = unpack('>3I', handle.read(12))
+		file_loc, table_loc, table_count = _HDR.unpack(handle.read(12))
 		handle.seek(table_loc)
 		for i in range(0, table_count, 2):
-			offset, size = unpack('>2I', handle.read(8))
+			offset, size = _TABLE.unpack(handle.read(8))
 			entries.append({'offset': offset, 'size': size})
-		handle.seek(file_loc)
-		self.data = handle.read()
+		buf = bytearray(os.fstat(handle.fileno()).st_size - file_loc)
+		if hasattr(os, 'preadv'):
+			os.preadv(handle.fileno(), [buf], file_loc)
+		else:
+			handle.seek(file_loc)
+			handle.readinto(buf)
+		self.data = memoryview(buf)
 		self.keys = {
 			'root': {
 				'id': 'MPQ',
@@ -1,31 +1,39 @@
 
 import json
-from struct import unpack
+import logging
+from struct import Struct
 from typing import BinaryIO
 
+log = logging.getLogger(__name__)
+
+_U8 = Struct("B")
+_U32 = Struct("<I")
+_IDPTR = Struct("<2H")
+
 class Data:
 	def __init__(self, adr: BinaryIO):
 		assert adr.read(4) == b'PAC '
-		count = unpack('<I', adr.read(4))[0]
+		count = _U32.unpack(adr.read(4))[0]
 		ENTRY = {}
 		for i in range(count):
-			id, ptr = unpack('<2H', adr.read(4))
+			id, ptr = _IDPTR.unpack(adr.read(4))
 			ptr &= 0x1FFFFF
-			size = unpack('B', adr.read(1))[0] << 16; adr.seek(-1, 1)
+			size = _U8.unpack(adr.read(1))[0] << 16; adr.seek(-1, 1)
 			address = ptr + size
-			size = ((unpack('<I', adr.read(4))[0]) << 32 & 0xFFFFFFFFFFFFFFFF) >> 40 & 0xFFFFFFFFFFFFFFFF
-			print(size)
+			size = ((_U32.unpack(adr.read(4))[0]) << 32 & 0xFFFFFFFFFFFFFFFF) >> 40 & 0xFFFFFFFFFFFFFFFF
+			if log.isEnabledFor(logging.DEBUG):
+				log.debug("entry %d size %d", id, size)
 			ENTRY.setdefault(id, {'address': address, 'size': size})
 
 		self.adr = {'id': 'PAC', 'keys': ENTRY}
-		self.data = adr.read()
+		self.data = memoryview(adr.read())
 
 	def dump(self, path: str):
 		with open(path, 'w') as jn:
 			json.dump(self.adr, jn, indent=4)
 
 
-	def __getitem__(self, key: int) -> bytes:
+	def __getitem__(self, key: int) -> memoryview:
 		v2 = self.adr['keys'][key]
 		return self.data[v2['address']:v2['address'] + v2['size']]
 
@@ -1,34 +1,45 @@
-from io import BytesIO
 import json
-from struct import pack
+import os
+from struct import Struct
+
+_U16 = Struct('<H')
+_U32 = Struct('<I')
+_PTR = Struct('<HB')
+
 class Data:
 	def write(self, path: str, out: str):
-		toc = BytesIO()
-		data = BytesIO()
+		toc = bytearray()
 		with open(path, 'r') as j:
-
 			d: dict = json.load(j)
-			for i, (key, record) in enumerate(d.items()):
-				for label, folder in record.items():
-					if label == 'path':
-						with open(folder, 'rb') as f:
-							adr = (data.tell()) + 1
-							da = f.read()
-							size = len(da)
-							data.write(da)
-							assert adr < (0xFFFFFF + 1)
-							excess = (adr & 0xFF0000) >> 16
-							ptr = (adr & 0x1FFFFF)
-							toc.write(pack('<H', int(key)))
-							toc.write(pack('<HB', ptr, excess))
-							packed = (size & 0xFFFFFF)
-							toc.write(pack('<I', packed))
-							toc.seek(-1, 1)
+		sources = [
+			(int(key), folder)
+			for key, record in d.items()
+			for label, folder in record.items()
+			if label == 'path'
+		]
+		sizes = [os.stat(folder).st_size for key, folder in sources]
+		data = bytearray(sum(sizes))
+		view = memoryview(data)
+		pos = 0
+		for (key, folder), size in zip(sources, sizes):
+			with open(folder, 'rb') as f:
+				adr = pos + 1
+				f.readinto(view[pos:pos + size])
+				pos += size
+				assert adr < (0xFFFFFF + 1)
+				excess = (adr & 0xFF0000) >> 16
+				ptr = (adr & 0x1FFFFF)
+				toc += _U16.pack(key)
+				toc += _PTR.pack(ptr, excess)
+				packed = (size & 0xFFFFFF)
+				toc += _U32.pack(packed)
+				del toc[-1]
+		toc.append(0)
 		with open(out, 'wb') as pac:
 			pac.write(b'PAC ')
-			pac.write(pack('<I', i + 1))
-			pac.write(toc.getvalue())
-			pac.write(data.getvalue())
+			pac.write(_U32.pack(len(d)))
+			pac.write(toc)
+			pac.write(data)
 			pac.flush()
 
 if __name__ == '__main__':
@@ -1,26 +1,33 @@
-from struct import pack, unpack
+from struct import pack, Struct
 from typing import BinaryIO
 
+_SIZEOFF = Struct('<2I')
+
 class FilePack:
 	def __init__(self, file_list: BinaryIO):
 		self.file = file_list
 		self.file.seek(8)
 		self.file.write(pack('<?', True)) # pretend we "converted the address"
 		self.file.seek(0)
+		self._index()
 
-
-	def __getitem__(self, index: int) -> tuple[str, str, int, int, bytes]:
-		self.file.seek(0)
+	def _index(self):
 		SIZE = 32
+		self.file.seek(0)
 		count = int.from_bytes(self.file.read(4), 'little')
-		if index < count:
-			self.file.seek([self.file.seek(12), int.from_bytes(self.file.read(4), 'little')][1])
-			ptr = index * SIZE
-			self.file.seek(ptr, 1)
-			table = self.file.read(SIZE)
+		self.file.seek(12)
+		table = int.from_bytes(self.file.read(4), 'little')
+		self.entries = []
+		for i in range(count):
+			self.file.seek(table + i * SIZE + SIZE)
 			name = self.file.read(16).split(b'\x00')[0].decode('cp1252')
 			ext = self.file.read(4).split(b'\x00')[0].decode('cp1252')
-			size, offset = unpack('<2I', self.file.read(8))
+			size, offset = _SIZEOFF.unpack(self.file.read(8))
+			self.entries.append((name, ext, size, offset))
+
+	def __getitem__(self, index: int) -> tuple[str, str, int, int, bytes]:
+		if index < len(self.entries):
+			name, ext, size, offset = self.entries[index]
 			self.file.seek(offset)
 			data = self.file.read(size)
 			return name, ext, size, offset, data